@@ -1,6 +1,8 @@
 import tkinter as tk
 import time
 import random  # For simulating some dynamic elements like spirit movements
+import numpy as np  # Parallel (SoA) arrays for character data and vectorized hit-testing
+from PIL import Image, ImageDraw, ImageFont, ImageTk  # Pre-rendered bitmaps for static canvas content
 
 # Comprehensive recreation of World of Light in Tkinter.
 # This code creates a 600x400 window with a canvas representing the World of Light map.
@@ -44,23 +46,28 @@ class WorldOfLight:
         self.player = self.canvas.create_oval(self.player_x-10, self.player_y-10, self.player_x+10, self.player_y+10, fill="pink", tags="player")
         
         # Map drawing - Simulate the full World of Light map with shapes
-        # Light Realm: Central area with paths
-        self.canvas.create_rectangle(0, 0, 2000, 1500, fill="lightgreen")  # Base terrain
+        # The terrain never changes, so it is painted once into a PIL image and shown as a single
+        # canvas image at the bottom of the stacking order; Tk then composites one bitmap per expose
+        rgb = lambda color: tuple(v >> 8 for v in self.root.winfo_rgb(color))  # Tk's color names, not PIL's
+        bg = Image.new("RGB", (2000, 1500), rgb("lightgreen"))  # Light Realm: Central area with paths
+        draw = ImageDraw.Draw(bg)
         # Forest area
-        self.canvas.create_oval(200, 200, 400, 400, fill="darkgreen", outline="")  # Forest circle
+        draw.ellipse((200, 200, 400, 400), fill=rgb("darkgreen"))  # Forest circle
         # Mountain
-        self.canvas.create_polygon(500, 100, 600, 300, 700, 100, fill="gray")
+        draw.polygon([(500, 100), (600, 300), (700, 100)], fill=rgb("gray"))
         # Lake (heart-shaped as in game)
-        self.canvas.create_polygon(800, 200, 850, 250, 900, 200, 850, 300, fill="blue")
+        draw.polygon([(800, 200), (850, 250), (900, 200), (850, 300)], fill=rgb("blue"))
         # City
-        self.canvas.create_rectangle(1000, 300, 1200, 500, fill="gray")
+        draw.rectangle((1000, 300, 1200, 500), fill=rgb("gray"), outline="black")
         # More areas: Military base, racetrack, temple, etc.
-        self.canvas.create_rectangle(300, 600, 500, 800, fill="khaki")  # Military base
-        self.canvas.create_oval(1400, 100, 1600, 300, fill="red")  # Racetrack oval
-        self.canvas.create_rectangle(1700, 400, 1900, 600, fill="gold")  # Temple of Light
+        draw.rectangle((300, 600, 500, 800), fill=rgb("khaki"), outline="black")  # Military base
+        draw.ellipse((1400, 100, 1600, 300), fill=rgb("red"), outline="black")  # Racetrack oval
+        draw.rectangle((1700, 400, 1900, 600), fill=rgb("gold"), outline="black")  # Temple of Light
+        self.bg_img = ImageTk.PhotoImage(bg)  # Keep a reference so Tk doesn't lose the image
+        self.canvas.tag_lower(self.canvas.create_image(0, 0, anchor="nw", image=self.bg_img))
         
         # Character locations - Dictionary with positions and names (from accurate game data)
-        self.characters = {
+        characters = {
             "Marth": (150, 150), "Sheik": (200, 300), "Villager": (300, 100),
             "Ryu": (250, 400), "Pac-Man": (350, 450), "Olimar": (400, 500),
             "Solid Snake": (450, 550), "Mega Man": (500, 600), "Donkey Kong": (550, 650),
@@ -78,28 +85,32 @@ class WorldOfLight:
             # Extend this dict to include all from the list: Ryu, Pac-Man, etc., up to the final bosses like Galeem and Dharkon.
         }
         
-        # Draw character markers - Red circles for locked, green for unlocked
-        self.char_markers = {}
-        self.unlocked = set(["Kirby"])  # Start with Kirby
-        for char, (x, y) in self.characters.items():
-            color = "green" if char in self.unlocked else "red"
-            marker = self.canvas.create_oval(x-5, y-5, x+5, y+5, fill=color)
-            self.canvas.create_text(x, y-15, text=char, fill="white", font=("Arial", 8))
-            self.char_markers[char] = marker
-            # Bind click to simulate battle
-            self.canvas.tag_bind(marker, "<Button-1>", lambda e, c=char: self.simulate_battle(c))
+        # Stored as parallel arrays indexed by an int character id: names, coordinates, unlocked mask
+        # and canvas marker item ids, plus the reverse item id -> character id map (filled in by build_markers)
+        self.char_names = list(characters)
+        self.char_xy = np.array(list(characters.values()), dtype=np.int32)
+        self.unlocked_mask = np.zeros(len(self.char_names), dtype=bool)  # Kirby starts unlocked but has no marker
+        self.marker_ids = []
+        self.marker_char = {}
+        
+        # Markers, labels and barriers are created in one idle batch (see build_markers)
+        self.root.after_idle(self.build_markers)
         
-        # Barriers and puzzles - Example: Water crossing requires spirit
-        self.barriers = [self.canvas.create_line(400, 400, 600, 600, fill="blue", width=10, tags="barrier")]
         self.spirits_collected = 0
         
-        # Key bindings for movement
-        self.root.bind("<Left>", self.move_left)
-        self.root.bind("<Right>", self.move_right)
-        self.root.bind("<Up>", self.move_up)
-        self.root.bind("<Down>", self.move_down)
+        # Twinkle lights - fixed pool of ovals created once and relocated every frame
+        self.twinkles = [self.canvas.create_oval(0, 0, 4, 4, fill="yellow", tags="twinkle") for _ in range(5)]
+        self.rng = np.random.default_rng()  # Draws all twinkle positions for a frame in one call
         
-        # Mouse drag for scrolling
+        # Key bindings for movement - only record which keys are held; update() moves the player once per frame
+        self.held = set()
+        self.speed = 300  # Player speed in pixels per second
+        self.root.bind("<KeyPress>", self.key_down)
+        self.root.bind("<KeyRelease>", self.key_up)
+        # Releases are never delivered once focus leaves (alt-tab, battle popup), so forget held keys then
+        self.root.bind("<FocusOut>", lambda e: self.held.clear())
+        
+        # Mouse drag for scrolling - also dispatches clicks on character markers (see start_drag)
         self.canvas.bind("<Button-1>", self.start_drag)
         self.canvas.bind("<B1-Motion>", self.drag)
         self.drag_data = {"x": 0, "y": 0}
@@ -107,12 +118,41 @@ class WorldOfLight:
         # Animation loop for 60 FPS
         self.fps = 60
         self.delay = 1000 // self.fps
-        self.last_time = time.time()
+        self.last_time = time.perf_counter()
         self.update()
     
+    def build_markers(self):
+        # Runs from after_idle so the window appears first and the canvas gets all ~150 items in
+        # a single batch; one update_idletasks() at the end redraws once instead of piecemeal
+        
+        # Character labels - each name is rasterized once into a PhotoImage, so Tk blits a bitmap
+        # on every expose instead of laying out text
+        label_font = ImageFont.load_default()
+        self.label_imgs = []
+        for name in self.char_names:
+            left, top, right, bottom = label_font.getbbox(name)
+            img = Image.new("RGBA", (right - left, bottom - top))  # Transparent background
+            ImageDraw.Draw(img).text((-left, -top), name, fill="white", font=label_font)
+            self.label_imgs.append(ImageTk.PhotoImage(img))
+        
+        # Draw character markers - Red circles for locked, green for unlocked
+        for i, (x, y) in enumerate(self.char_xy.tolist()):
+            color = "green" if self.unlocked_mask[i] else "red"
+            marker = self.canvas.create_oval(x-5, y-5, x+5, y+5, fill=color, tags="char")
+            self.marker_ids.append(marker)
+            self.marker_char[marker] = i
+            self.canvas.create_image(x, y-15, image=self.label_imgs[i])
+        
+        # Barriers and puzzles - Example: Water crossing requires spirit
+        self.barriers = [self.canvas.create_line(400, 400, 600, 600, fill="blue", width=10, tags="barrier")]
+        self.canvas.update_idletasks()
+    
     def start_drag(self, event):
         self.drag_data["x"] = event.x
         self.drag_data["y"] = event.y
+        # A click on a marker also simulates a battle for the character that marker belongs to
+        if "char" in self.canvas.gettags("current"):
+            self.simulate_battle(self.marker_char[self.canvas.find_withtag("current")[0]])
     
     def drag(self, event):
         dx = event.x - self.drag_data["x"]
@@ -122,61 +162,64 @@ class WorldOfLight:
         self.drag_data["x"] = event.x
         self.drag_data["y"] = event.y
     
-    def move_left(self, event):
-        self.player_x -= 5
-        self.update_player()
+    def key_down(self, event):
+        self.held.add(event.keysym)
     
-    def move_right(self, event):
-        self.player_x += 5
-        self.update_player()
-    
-    def move_up(self, event):
-        self.player_y -= 5
-        self.update_player()
-    
-    def move_down(self, event):
-        self.player_y += 5
-        self.update_player()
+    def key_up(self, event):
+        self.held.discard(event.keysym)
     
     def update_player(self):
         self.canvas.coords(self.player, self.player_x-10, self.player_y-10, self.player_x+10, self.player_y+10)
         # Check collisions with characters or barriers
-        for char, (x, y) in self.characters.items():
-            if abs(self.player_x - x) < 20 and abs(self.player_y - y) < 20 and char not in self.unlocked:
-                self.simulate_battle(char)
+        hits = ((np.abs(self.char_xy[:, 0] - self.player_x) < 20)
+                & (np.abs(self.char_xy[:, 1] - self.player_y) < 20)
+                & ~self.unlocked_mask)
+        if hits.any():
+            self.simulate_battle(int(np.argmax(hits)))
         # Barrier check example
         if self.player_x > 400 and self.spirits_collected < 1:
             self.player_x = 400  # Block
             self.update_player()
     
-    def simulate_battle(self, char):
+    def simulate_battle(self, i):
+        char = self.char_names[i]
         # Popup for battle simulation
         battle_win = tk.Toplevel(self.root)
         battle_win.title(f"Battle vs {char}")
         tk.Label(battle_win, text=f"Simulating fight against {char}... Win!").pack()
-        tk.Button(battle_win, text="Close", command=lambda: self.unlock_char(char, battle_win)).pack()
+        tk.Button(battle_win, text="Close", command=lambda: self.unlock_char(i, battle_win)).pack()
     
-    def unlock_char(self, char, win):
+    def unlock_char(self, i, win):
         win.destroy()
-        self.unlocked.add(char)
-        self.canvas.itemconfig(self.char_markers[char], fill="green")
-        self.fighters_label.config(text=f"Fighters: {len(self.unlocked)}/74")
+        self.unlocked_mask[i] = True
+        self.canvas.itemconfig(self.marker_ids[i], fill="green")
+        self.fighters_label.config(text=f"Fighters: {1 + int(self.unlocked_mask.sum())}/74")  # +1 for Kirby
         self.spirits_collected += random.randint(1, 3)  # Simulate spirit gain
         self.spirits_label.config(text=f"Spirits: {self.spirits_collected}")
         self.skills_label.config(text=f"Skill Points: {self.spirits_collected // 2}")
     
     def update(self):
         # Animation loop: Update FPS, perhaps animate spirits or light effects
-        current_time = time.time()
-        dt = current_time - self.last_time
-        self.last_time = current_time
-        # Example animation: Twinkle lights on map
-        for i in range(5):
-            x = random.randint(0, 2000)
-            y = random.randint(0, 1500)
-            self.canvas.create_oval(x-2, y-2, x+2, y+2, fill="yellow", tags="twinkle")
-        self.canvas.delete("twinkle")  # Clean up old ones, but this is placeholder
-        self.root.after(self.delay, self.update)
+        frame_start = time.perf_counter()
+        dt = frame_start - self.last_time
+        self.last_time = frame_start
+        # Player movement from the held arrow keys, at most once per frame
+        # dt is clamped so a long frame (marker batch, popup) can't jump the player past a hit box
+        dx = ("Right" in self.held) - ("Left" in self.held)
+        dy = ("Down" in self.held) - ("Up" in self.held)
+        if dx or dy:
+            step = self.speed * min(dt, 2 * self.delay / 1000)
+            self.player_x += dx * step
+            self.player_y += dy * step
+            self.update_player()
+        # Example animation: Twinkle lights on map, reusing the pooled items
+        pts = self.rng.integers((0, 0), (2000, 1500), size=(len(self.twinkles), 2), endpoint=True)
+        for item, (x, y) in zip(self.twinkles, pts.tolist()):
+            self.canvas.coords(item, x-2, y-2, x+2, y+2)
+        # Pace to a steady 60 FPS: subtract this frame's work from the delay, and run the
+        # next frame from after_idle so it never starts before Tk has flushed the last redraw
+        elapsed_ms = int((time.perf_counter() - frame_start) * 1000)
+        self.root.after(max(1, self.delay - elapsed_ms), self.root.after_idle, self.update)
 
 # Run the game
 root = tk.Tk()
@@ -12,22 +12,33 @@ SPACE  : Hard‑drop
 ESC    : Quit
 
 Optional at start‑up: type a launch level (0–9) in the terminal to set gravity speed.
+
+The module is fully annotated so it can be compiled ahead of time with mypyc
+(`pip install mypy` then `mypyc tetris4k.py`); start the compiled build with
+`python -c "import tetris4k; tetris4k.main()"`, since running the .py file
+directly always uses the interpreted source.
 """
 
+from __future__ import annotations
+from typing import Sequence
 import pygame, random, sys, time
 
 # -----------  CONSTANTS  -----------
 BLOCK = 24                           # square size in px
 COLS, ROWS = 10, 20                  # play‑field
 WIDTH, HEIGHT = COLS*BLOCK, ROWS*BLOCK
+FULL_MASK    = (1<<COLS)-1           # board rows are ints, bit c set = column c occupied
 FPS          = 60
+DAS_DELAY    = 250                   # ms a held ←/→ waits before auto‑shifting
+DAS_REPEAT   = 60                    # ms between auto‑shift steps
+MAX_FRAME_MS = 100                   # longest frame fed to gravity, so a stall can't burst‑drop pieces
 
 # Monochrome palette – light‑green on black CRT style
 BG_COLOUR    = (  0,   0,   0)
 BRICK_COLOUR = (  0, 220,   0)
 GRID_COLOUR  = (  0, 110,   0)
 
-SHAPES = [
+TETROMINOES = [
     [[1,1,1,1]],                                        # I
     [[1,1],[1,1]],                                      # O
     [[0,1,0],[1,1,1]],                                  # T
@@ -38,155 +49,250 @@ SHAPES = [
 ]
 
 # Pre‑compute all four rotations for each tetromino (simplest CW turn)
-def rotations(shape):
+# All shape tables are frozen to tuples: immutable, compact, read‑only at runtime
+def rotations(shape: list[list[int]]) -> tuple[tuple[tuple[int, ...], ...], ...]:
     rots = []
-    m = shape
+    m = tuple(tuple(row) for row in shape)
     for _ in range(4):
         rots.append(m)
-        m = [list(row)[::-1] for row in zip(*m)]
-    return rots
+        m = tuple(row[::-1] for row in zip(*m))
+    return tuple(rots)
+
+SHAPES = tuple(rotations(s) for s in TETROMINOES)
+
+# (row, col) offsets of the set cells of every rotation, for drawing
+SHAPE_CELLS = tuple(tuple(tuple((r,c) for r,row in enumerate(rot) for c,val in enumerate(row) if val)
+                          for rot in rots) for rots in SHAPES)
 
-SHAPES = [rotations(s) for s in SHAPES]
+# (row offset, column bitmask) per row of every rotation, for bitwise collision tests
+def row_masks(rot: tuple[tuple[int, ...], ...]) -> tuple[tuple[int, int], ...]:
+    return tuple((r, sum(1<<c for c,val in enumerate(row) if val)) for r,row in enumerate(rot))
+
+SHAPE_ROWS = tuple(tuple(row_masks(rot) for rot in rots) for rots in SHAPES)
 
 # ----------  MODEL CLASSES ----------
 class Piece:
-    def __init__(self):
-        self.type   = random.randrange(len(SHAPES))
-        self.rot    = 0
-        self.shape  = SHAPES[self.type]
-        self.x      = COLS//2 - len(self.shape[0][0])//2
-        self.y      = 0
-    def image(self):      return self.shape[self.rot]
-    def rotate(self):     self.rot = (self.rot+1) % 4
+    def __init__(self) -> None:
+        self.type: int = random.randrange(len(SHAPES))
+        self.rot:  int = 0
+        self.shape     = SHAPES[self.type]
+        self.x:    int = COLS//2 - len(self.shape[0][0])//2
+        self.y:    int = 0
+    def image(self) -> tuple[tuple[int, ...], ...]: return self.shape[self.rot]
+    def rotate(self) -> None:                       self.rot = (self.rot+1) % 4
 
 class Game:
-    def __init__(self, start_level=0):
-        self.board   = [[0]*COLS for _ in range(ROWS)]
+    def __init__(self, start_level: int = 0) -> None:
+        self.board: list[int] = [0]*ROWS   # one bitmask per row
         self.cur     = Piece()
         self.next    = Piece()
         self.score   = 0
         self.preview = False       # OFF by default
         self.drop_ms = max(50, 1000 - 100*start_level)
-        self.next_drop = pygame.time.get_ticks()+self.drop_ms
+        self.accum   = 0           # ms of game time not yet consumed by gravity steps
         self.thousands = 0         # tick‑marks after 999
+        self.das_dir   = 0         # held ←/→ direction (-1/+1), 0 if none
+        self.das_timer = 0         # next auto‑shift time
+        self.full_redraw = True    # board/score/preview changed: repaint everything
+        self.prev_piece_rects: list[pygame.Rect] = []  # screen cells the current piece covered last frame
     # --- helpers ---
-    def block_at(self, x,y): return 0<=x<COLS and 0<=y<ROWS and self.board[y][x]
-    def fits(self, piece, dx,dy,rot):
-        img = piece.shape[(piece.rot+rot)%4]
-        for r,row in enumerate(img):
-            for c,val in enumerate(row):
-                if val:
-                    nx, ny = piece.x+c+dx, piece.y+r+dy
-                    if nx<0 or nx>=COLS or ny>=ROWS or (ny>=0 and self.board[ny][nx]):
-                        return False
+    def block_at(self, x: int, y: int) -> bool: return 0<=x<COLS and 0<=y<ROWS and bool(self.board[y]>>x & 1)
+    def cells(self, piece: Piece) -> list[tuple[int, int]]:
+        return [(piece.x+c, piece.y+r) for r,c in SHAPE_CELLS[piece.type][piece.rot]]
+    def fits(self, piece: Piece, dx: int, dy: int, rot: int) -> bool:
+        x, y = piece.x+dx, piece.y+dy
+        if x<0: return False          # every rotation occupies its column 0
+        board = self.board
+        for r,mask in SHAPE_ROWS[piece.type][(piece.rot+rot)%4]:
+            m = mask<<x
+            if m>FULL_MASK or y+r>=ROWS: return False
+            if y+r>=0 and board[y+r] & m: return False   # rows above the top never collide
         return True
+    def drop_distance(self, piece: Piece) -> int:
+        # rows the piece can fall; one pass with the masks pre-shifted, instead of fits() per row
+        masks = [(r, mask<<piece.x) for r,mask in SHAPE_ROWS[piece.type][piece.rot]]
+        board = self.board
+        y = piece.y+1
+        while True:
+            for r,m in masks:
+                if y+r>=ROWS or (y+r>=0 and board[y+r] & m):
+                    return y-1-piece.y
+            y += 1
     # --- actions ---
-    def commit(self):
-        for r,row in enumerate(self.cur.image()):
-            for c,val in enumerate(row):
-                if val:
-                    y = self.cur.y+r
-                    x = self.cur.x+c
-                    if y<0:       # game over
-                        return False
-                    self.board[y][x]=1
+    def commit(self) -> bool:
+        x, y = self.cur.x, self.cur.y
+        if y<0:                       # game over
+            return False
+        for r,mask in SHAPE_ROWS[self.cur.type][self.cur.rot]:
+            self.board[y+r] |= mask<<x
         self.clear_lines()
+        self.full_redraw = True
         self.cur = self.next
         self.next = Piece()
         return True
-    def clear_lines(self):
-        new = [row for row in self.board if any(v==0 for v in row)]
-        cleared = ROWS - len(new)
-        if cleared:
-            self.board = [[0]*COLS for _ in range(cleared)] + new
+    def clear_lines(self) -> None:
+        board = self.board
+        if FULL_MASK in board:        # most commits clear nothing: no allocation, no rebuild
+            for y in range(ROWS):     # top-down, so rows below y keep their index
+                if board[y]==FULL_MASK:
+                    del board[y]      # in-place memmove of the rows above down by one
+                    board.insert(0, 0)
         # scoring: +1 per piece +5 bonus if preview OFF (per original)
         self.score += 1 + (5 if not self.preview else 0)
         if self.score>999:
             self.score -= 1000
             self.thousands += 1
     # -------- main update ----------
-    def update(self, keys, now):
-        moved=False
-        if keys[pygame.K_LEFT]  and self.fits(self.cur,-1,0,0): self.cur.x-=1; moved=True
-        if keys[pygame.K_RIGHT] and self.fits(self.cur, 1,0,0): self.cur.x+=1; moved=True
-        if keys[pygame.K_DOWN]  and self.fits(self.cur, 0,1,0): self.cur.y+=1; moved=True
-        if keys[pygame.K_UP] or keys[pygame.K_w]:
-            if self.fits(self.cur,0,0,1): self.cur.rotate(); moved=True
-        if keys[pygame.K_SPACE]:          # hard‑drop
-            while self.fits(self.cur,0,1,0): self.cur.y+=1
-            if not self.commit(): return False
-            self.next_drop = now+self.drop_ms
-            moved=True
-        if now>=self.next_drop and not moved:
-            if self.fits(self.cur,0,1,0):
-                self.cur.y+=1
-            else:
-                if not self.commit(): return False
-            self.next_drop = now+self.drop_ms
+    # all methods below return False on game over
+    def update(self, keys: Sequence[bool], events: list[pygame.event.Event], now: int, dt: int) -> bool:
+        # input once per rendered frame; gravity in fixed drop_ms steps, independent of frame rate
+        if not self.handle_input(keys, events, now): return False
+        self.accum += min(dt, MAX_FRAME_MS)
+        while self.accum >= self.drop_ms:
+            self.accum -= self.drop_ms
+            if not self.gravity_step(): return False
+        return True
+    def handle_input(self, keys: Sequence[bool], events: list[pygame.event.Event], now: int) -> bool:
+        # move / rotate / hard‑drop act once per KEYDOWN; ←/→ auto‑repeat via DAS below
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                if event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                    self.das_dir   = -1 if event.key==pygame.K_LEFT else 1
+                    self.das_timer = now+DAS_DELAY
+                    if self.fits(self.cur,self.das_dir,0,0): self.cur.x+=self.das_dir
+                elif event.key in (pygame.K_UP, pygame.K_w):
+                    if self.fits(self.cur,0,0,1): self.cur.rotate()
+                elif event.key == pygame.K_SPACE:          # hard‑drop
+                    self.cur.y += self.drop_distance(self.cur)
+                    if not self.commit(): return False
+                    self.accum = 0                         # new piece gets a full gravity interval
+            elif event.type == pygame.KEYUP:
+                if (event.key, self.das_dir) in ((pygame.K_LEFT,-1), (pygame.K_RIGHT,1)):
+                    # fall back to the other arrow if it is still held, restarting its DAS delay
+                    das_dir = -1 if keys[pygame.K_LEFT] else 1 if keys[pygame.K_RIGHT] else 0
+                    if das_dir != self.das_dir:
+                        self.das_dir   = das_dir
+                        self.das_timer = now+DAS_DELAY
+        if self.das_dir and now>=self.das_timer:
+            if self.fits(self.cur,self.das_dir,0,0): self.cur.x+=self.das_dir
+            self.das_timer = now+DAS_REPEAT
+        if keys[pygame.K_DOWN]  and self.fits(self.cur, 0,1,0): self.cur.y+=1
         return True
+    def gravity_step(self) -> bool:
+        if self.fits(self.cur,0,1,0):
+            self.cur.y+=1
+            return True
+        return self.commit()
 
 # -------------  DRAWING -------------
-def draw_square(screen, x,y):
-    rect = pygame.Rect(x*BLOCK, y*BLOCK, BLOCK, BLOCK)
-    pygame.draw.rect(screen, BRICK_COLOUR, rect)
-    pygame.draw.rect(screen, GRID_COLOUR, rect, 1)
+# pre-rendered assets, built once by load_assets() after the display exists
+BRICK_SURF:  pygame.Surface                              # one square
+SCORE_LABEL: pygame.Surface                              # " SCORE " caption
+NEXT_LABEL:  pygame.Surface                              # "NEXT" caption
+GLYPHS:      dict[str, pygame.Surface] = {}              # score characters '0'..'9' and "'"
+SCORE_CACHE: dict[tuple[int, int], pygame.Surface] = {}  # (thousands, score) -> composed score surface
+
+def load_assets() -> None:
+    global BRICK_SURF, SCORE_LABEL, NEXT_LABEL
+    BRICK_SURF = pygame.Surface((BLOCK, BLOCK)).convert()
+    BRICK_SURF.fill(BRICK_COLOUR)
+    pygame.draw.rect(BRICK_SURF, GRID_COLOUR, BRICK_SURF.get_rect(), 1)
+    font = pygame.font.SysFont("Courier", 20, bold=True)
+    SCORE_LABEL = font.render(" SCORE ", True, BRICK_COLOUR)
+    GLYPHS.update((c, font.render(c, True, BRICK_COLOUR)) for c in "0123456789'")
+    NEXT_LABEL = pygame.font.SysFont("Courier", 16).render("NEXT", True, GRID_COLOUR)
+
+def score_surface(game: Game) -> pygame.Surface:
+    key = (game.thousands, game.score)
+    surf = SCORE_CACHE.get(key)
+    if surf is None:
+        glyphs = [SCORE_LABEL] + [GLYPHS[c] for c in f"{game.thousands}'{game.score:03}"]
+        surf = pygame.Surface((sum(g.get_width() for g in glyphs), SCORE_LABEL.get_height())).convert()
+        surf.fill(BG_COLOUR)
+        x = 0
+        for g in glyphs:
+            surf.blit(g, (x, 0))
+            x += g.get_width()
+        SCORE_CACHE.clear()          # only the latest score is ever shown again
+        SCORE_CACHE[key] = surf
+    return surf
+
+# one persistent Rect per play‑field cell, shared by every draw instead of allocated per frame
+CELL_RECTS = tuple(tuple(pygame.Rect(x*BLOCK, y*BLOCK, BLOCK, BLOCK) for x in range(COLS)) for y in range(ROWS))
 
-def render(screen, game):
+def piece_rects(game: Game) -> list[pygame.Rect]:
+    return [CELL_RECTS[y][x] for x,y in game.cells(game.cur) if y>=0]
+
+def render(screen: pygame.Surface, game: Game) -> None:
+    if game.full_redraw:
+        render_full(screen, game)
+        return
+    # only the falling piece moved: restore its old cells, draw the new ones, push just those
+    rects = piece_rects(game)
+    if rects == game.prev_piece_rects:
+        return
+    for r in game.prev_piece_rects:
+        # a piece spawned onto a topped‑out stack overlaps board bricks, so repaint what the board holds
+        if game.block_at(r.x//BLOCK, r.y//BLOCK):
+            screen.blit(BRICK_SURF, r)
+        else:
+            screen.fill(BG_COLOUR, r)
+    screen.blits([(BRICK_SURF, r) for r in rects], doreturn=False)
+    pygame.draw.rect(screen, GRID_COLOUR, (0,0,WIDTH,HEIGHT), 2)   # erased edge cells cut the border
+    pygame.display.update(game.prev_piece_rects + rects)
+    game.prev_piece_rects = rects
+
+def render_full(screen: pygame.Surface, game: Game) -> None:
     screen.fill(BG_COLOUR)
-    # grid
-    for y in range(ROWS):
-        for x in range(COLS):
-            if game.board[y][x]:
-                draw_square(screen,x,y)
-    # current piece
-    for r,row in enumerate(game.cur.image()):
-        for c,val in enumerate(row):
-            if val and game.cur.y+r>=0:
-                draw_square(screen, game.cur.x+c, game.cur.y+r)
+    # grid + current piece, blitted in a single batch
+    rects = piece_rects(game)
+    seq = [(BRICK_SURF, CELL_RECTS[y][x])
+           for y,row in enumerate(game.board) if row for x in range(COLS) if row>>x & 1]
+    seq += [(BRICK_SURF, r) for r in rects]
+    screen.blits(seq, doreturn=False)
     # border
     pygame.draw.rect(screen, GRID_COLOUR, (0,0,WIDTH,HEIGHT), 2)
     # side panel (text)
-    font = pygame.font.SysFont("Courier", 20, bold=True)
-    score_txt = font.render(f" SCORE {game.thousands}'{game.score:03}", True, BRICK_COLOUR)
-    screen.blit(score_txt, (WIDTH+20, 30))
+    screen.blit(score_surface(game), (WIDTH+20, 30))
     if game.preview:
-        font_s = pygame.font.SysFont("Courier", 16)
-        screen.blit(font_s.render("NEXT", True, GRID_COLOUR), (WIDTH+36, 70))
-        for r,row in enumerate(game.next.image()):
-            for c,val in enumerate(row):
-                if val:
-                    x = WIDTH+40 + c*BLOCK
-                    y = 90 + r*BLOCK
-                    pygame.draw.rect(screen, BRICK_COLOUR, (x,y,BLOCK,BLOCK))
-                    pygame.draw.rect(screen, GRID_COLOUR, (x,y,BLOCK,BLOCK), 1)
+        screen.blit(NEXT_LABEL, (WIDTH+36, 70))
+        screen.blits([(BRICK_SURF, (WIDTH+40 + c*BLOCK, 90 + r*BLOCK))
+                      for r,c in SHAPE_CELLS[game.next.type][game.next.rot]], doreturn=False)
     pygame.display.flip()
+    game.prev_piece_rects = rects
+    game.full_redraw = False
 
 # -------------  MAIN LOOP -----------
-def main():
+def main() -> None:
     pygame.init()
     screen = pygame.display.set_mode((WIDTH+140, HEIGHT))
+    load_assets()
     pygame.display.set_caption("TETRIS (Electronika‑60 recreation)")
-    clock = pygame.time.Clock()
 
     try:
         start_lvl = int(input("Launch level (0–9)? ") or "0")
     except ValueError:
         start_lvl = 0
     game = Game(start_lvl)
+    clock = pygame.time.Clock()    # created after the prompt so the first dt is one frame
 
     while True:
+        dt = clock.tick(FPS)       # ms since the previous frame, fed to the gravity accumulator
         now = pygame.time.get_ticks()
-        keys = pygame.key.get_pressed()
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        keys = pygame.key.get_pressed()    # after the event pump, so it matches the KEYUPs just read
+        for event in events:
             if event.type == pygame.QUIT: pygame.quit(); sys.exit()
             if event.type == pygame.KEYDOWN and event.key==pygame.K_ESCAPE:
                 pygame.quit(); sys.exit()
             if event.type == pygame.KEYDOWN and event.key==pygame.K_1:
                 game.preview = not game.preview          # toggle like original
+                game.full_redraw = True
+            if event.type == pygame.WINDOWEXPOSED:       # window contents lost: repaint everything
+                game.full_redraw = True
 
-        if not game.update(keys, now): break            # game over
+        if not game.update(keys, events, now, dt): break    # game over
         render(screen, game)
-        clock.tick(FPS)
 
     # simple game‑over splash
     font = pygame.font.SysFont("Courier", 28, bold=True)